@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import random
 from datetime import date
 from typing import Optional, Tuple
 
@@ -16,12 +18,16 @@ SAFARI_UA = (
 )
 
 
+_BASE_HEADERS = {
+    "Accept": "*/*",
+    "Accept-Language": "en-US,en;q=0.9",
+    "User-Agent": SAFARI_UA,
+}
+
+
 def build_headers(cookie: Optional[str]) -> dict[str, str]:
-    headers = {
-        "Accept": "*/*",
-        "Accept-Language": "en-US,en;q=0.9",
-        "User-Agent": SAFARI_UA,
-    }
+    # Called once per client; the cookie state is logged here and not per fetch.
+    headers = dict(_BASE_HEADERS)
     if cookie:
         # Never log the cookie value. Only indicate presence.
         headers["Cookie"] = cookie
@@ -31,32 +37,60 @@ def build_headers(cookie: Optional[str]) -> dict[str, str]:
     return headers
 
 
-async def fetch_course_page(
-    client: httpx.AsyncClient, course_id: int, cookie: Optional[str]
+def build_client(cookie: Optional[str]) -> httpx.AsyncClient:
+    # One long-lived client so refreshes reuse the pooled (HTTP/2) connection
+    # instead of paying a fresh TCP+TLS handshake every time.
+    return httpx.AsyncClient(
+        http2=True,
+        headers=build_headers(cookie),
+        limits=httpx.Limits(max_connections=10, max_keepalive_connections=5, keepalive_expiry=300.0),
+        # Conservative timeouts
+        timeout=httpx.Timeout(15.0, connect=10.0),
+        # Non-2xx responses are errors now, so resolve redirects instead
+        follow_redirects=True,
+    )
+
+
+MAX_ATTEMPTS = 3
+
+
+def _is_retryable_status(status: int) -> bool:
+    return status == 429 or status >= 500
+
+
+async def _get_with_retries(
+    client: httpx.AsyncClient, url: str, what: str
 ) -> Tuple[bytes, Optional[str]]:
-    url = f"https://www.fitx.de/courses/{course_id}"
-    headers = build_headers(cookie)
-    # Conservative timeouts
-    for attempt in range(3):
+    for attempt in range(MAX_ATTEMPTS):
         try:
-            resp = await client.get(url, headers=headers, timeout=httpx.Timeout(15.0, connect=10.0))
+            resp = await client.get(url)
+            resp.raise_for_status()
             ct = resp.headers.get("content-type")
             return resp.content, ct
-        except Exception as e:
-            logger.warning("Fetch attempt %s failed: %s", attempt + 1, e)
-    raise RuntimeError("Failed to fetch FitX schedule after 3 attempts")
+        except httpx.HTTPStatusError as e:
+            status = e.response.status_code
+            if not _is_retryable_status(status):
+                # 4xx (other than 429) will not change on retry
+                raise
+            logger.warning("Fetch attempt %s failed (%s): HTTP %s", attempt + 1, what, status)
+        except httpx.TransportError as e:
+            # Connect/read timeouts, connection resets, protocol errors
+            logger.warning("Fetch attempt %s failed (%s): %s", attempt + 1, what, e)
+        if attempt + 1 < MAX_ATTEMPTS:
+            # Exponential backoff with jitter: ~1s, ~2s, ... capped at 8s
+            await asyncio.sleep(min(2**attempt, 8) + random.random())
+    raise RuntimeError(f"Failed to fetch FitX {what} after {MAX_ATTEMPTS} attempts")
+
+
+async def fetch_course_page(
+    client: httpx.AsyncClient, course_id: int
+) -> Tuple[bytes, Optional[str]]:
+    url = f"https://www.fitx.de/courses/{course_id}"
+    return await _get_with_retries(client, url, "schedule")
 
 
 async def fetch_kursplan_html(
-    client: httpx.AsyncClient, branch_id: int, date_from: date, cookie: Optional[str]
+    client: httpx.AsyncClient, branch_id: int, date_from: date
 ) -> Tuple[bytes, Optional[str]]:
     url = f"https://www.fitx.de/kursplan/{branch_id}?dateFrom={date_from.isoformat()}"
-    headers = build_headers(cookie)
-    for attempt in range(3):
-        try:
-            resp = await client.get(url, headers=headers, timeout=httpx.Timeout(15.0, connect=10.0))
-            ct = resp.headers.get("content-type")
-            return resp.content, ct
-        except Exception as e:
-            logger.warning("Fetch attempt %s failed (kursplan): %s", attempt + 1, e)
-    raise RuntimeError("Failed to fetch FitX kursplan after 3 attempts")
+    return await _get_with_retries(client, url, "kursplan")
@@ -1,31 +1,41 @@
 from __future__ import annotations
 
 import datetime as _dt
+import functools
+import re
 from typing import Iterable, List
 
 from .models import CourseEvent
 
 
-def _escape_ics(text: str) -> str:
-    s = (
-        text.replace("\\", "\\\\")
-        .replace(";", "\\;")
-        .replace(",", "\\,")
-        .replace("\r\n", "\\n")
-        .replace("\n", "\\n")
-    )
-    return s
+_ESCAPE_TRANS = str.maketrans({"\\": "\\\\", ";": "\\;", ",": "\\,"})
+_NEWLINE_RE = re.compile(r"\r\n|\n")
+_NEEDS_ESCAPE_RE = re.compile(r"[\\;,\r\n]")
+
+
+def _escape_ics_text(text: str) -> str:
+    # Most titles/locations need no escaping at all
+    if not _NEEDS_ESCAPE_RE.search(text):
+        return text
+    return _NEWLINE_RE.sub(r"\\n", text.translate(_ESCAPE_TRANS))
+
 
+# Recurring classes repeat the same title/location/description strings many
+# times per calendar, so memoize; bounded, so no explicit clearing is needed.
+# Unique values (UIDs) go through _escape_ics_text to keep them out of the cache.
+_escape_ics = functools.lru_cache(maxsize=2048)(_escape_ics_text)
 
-def _fold_line(line: str) -> List[str]:
+
+def _fold(line: str) -> str:
     # RFC 5545: lines MUST be folded at 75 octets; we approximate 75 chars.
-    max_len = 75
-    out: List[str] = []
-    while len(line) > max_len:
-        out.append(line[:max_len])
-        line = " " + line[max_len:]
-    out.append(line)
-    return out
+    # Returns the CRLF-terminated (and folded, if needed) content line.
+    n = len(line)
+    if n <= 75:
+        return line + "\r\n"
+    parts = [line[:75]]
+    for i in range(75, n, 74):
+        parts.append(" " + line[i : i + 74])
+    return "\r\n".join(parts) + "\r\n"
 
 
 def _vtz_europe_berlin() -> List[str]:
@@ -53,34 +63,47 @@ def _vtz_europe_berlin() -> List[str]:
 
 
 def _fmt_dt_utc(dt: _dt.datetime) -> str:
-    return dt.astimezone(_dt.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    if dt.tzinfo is not _dt.timezone.utc:
+        dt = dt.astimezone(_dt.timezone.utc)
+    return f"{_fmt_local(dt)}Z"
 
 
 def _fmt_local(dt: _dt.datetime) -> str:
-    # No Z; local time with TZID provided on property
-    return dt.strftime("%Y%m%dT%H%M%S")
+    # No Z; local time with TZID provided on property.
+    # Manual formatting of the fixed pattern is much cheaper than strftime.
+    return f"{dt.year:04d}{dt.month:02d}{dt.day:02d}T{dt.hour:02d}{dt.minute:02d}{dt.second:02d}"
+
+
+# Constant calendar prelude (incl. VTIMEZONE) and trailer, built once.
+_HEADER = "".join(
+    _fold(ln)
+    for ln in (
+        "BEGIN:VCALENDAR",
+        "PRODID:-//fitx-local//ics//EN",
+        "VERSION:2.0",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        *_vtz_europe_berlin(),
+    )
+)
+_FOOTER = "END:VCALENDAR\r\n"
 
 
 def generate_ics(course_id: int, events: Iterable[CourseEvent]) -> str:
-    now = _dt.datetime.now(tz=_dt.timezone.utc)
-    lines: List[str] = []
-    lines.append("BEGIN:VCALENDAR")
-    lines.append("PRODID:-//fitx-local//ics//EN")
-    lines.append("VERSION:2.0")
-    lines.append("CALSCALE:GREGORIAN")
-    lines.append("METHOD:PUBLISH")
-    lines.extend(_vtz_europe_berlin())
+    dtstamp = _fold(f"DTSTAMP:{_fmt_dt_utc(_dt.datetime.now(tz=_dt.timezone.utc))}")
+    out: List[str] = [_HEADER]
+    emit = out.append
 
     sorted_events = sorted(events, key=lambda e: (e.start, e.title))
     for ev in sorted_events:
-        lines.append("BEGIN:VEVENT")
+        emit("BEGIN:VEVENT\r\n")
         # Ensure UID uniqueness across multiple occurrences of the same course.
         uid = f"fitx-{course_id}-{ev.id}-{int(ev.start.timestamp())}"
-        lines.append(f"UID:{_escape_ics(uid)}@local")
-        lines.append(f"DTSTAMP:{_fmt_dt_utc(now)}")
-        lines.append(f"DTSTART;TZID=Europe/Berlin:{_fmt_local(ev.start)}")
-        lines.append(f"DTEND;TZID=Europe/Berlin:{_fmt_local(ev.end)}")
-        lines.append(f"SUMMARY:{_escape_ics(ev.title)}")
+        emit(_fold(f"UID:{_escape_ics_text(uid)}@local"))
+        emit(dtstamp)
+        emit(_fold(f"DTSTART;TZID=Europe/Berlin:{_fmt_local(ev.start)}"))
+        emit(_fold(f"DTEND;TZID=Europe/Berlin:{_fmt_local(ev.end)}"))
+        emit(_fold(f"SUMMARY:{_escape_ics(ev.title)}"))
 
         desc_parts: List[str] = []
         if ev.instructor:
@@ -91,15 +114,10 @@ def generate_ics(course_id: int, events: Iterable[CourseEvent]) -> str:
             desc_parts.append(ev.description)
         if desc_parts:
             _desc_joined = "\n".join(desc_parts)
-            lines.append(f"DESCRIPTION:{_escape_ics(_desc_joined)}")
+            emit(_fold(f"DESCRIPTION:{_escape_ics(_desc_joined)}"))
         if ev.location:
-            lines.append(f"LOCATION:{_escape_ics(ev.location)}")
-        lines.append("END:VEVENT")
-
-    lines.append("END:VCALENDAR")
+            emit(_fold(f"LOCATION:{_escape_ics(ev.location)}"))
+        emit("END:VEVENT\r\n")
 
-    # Fold lines
-    folded: List[str] = []
-    for ln in lines:
-        folded.extend(_fold_line(ln))
-    return "\r\n".join(folded) + "\r\n"
+    emit(_FOOTER)
+    return "".join(out)
@@ -1,21 +1,30 @@
 from __future__ import annotations
 
 import asyncio
+import gzip
+import hashlib
 import json
 import logging
 import os
+import re
 import signal
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import List, Optional
 
 import httpx
 from fastapi import FastAPI, Header, HTTPException, Response
 
-from .fetcher import fetch_course_page, fetch_kursplan_html
+try:
+    import brotli
+except ImportError:  # serve gzip/identity only
+    brotli = None
+
+from .fetcher import build_client, fetch_course_page, fetch_kursplan_html
 from .ics import generate_ics
 from .models import CourseEvent
-from .parser import parse_schedule
-from .store import ensure_data_dir, load_cache, save_cache
+from .parser import dedupe_events, parse_schedule
+from .store import ensure_data_dir, encode_events, events_digest, load_cache, save_cache
 
 
 logging.basicConfig(
@@ -43,6 +52,12 @@ def _parse_exclude_keywords(raw: str) -> list[str]:
     return [s for s in items if s]
 
 EXCLUDE_KEYWORDS = _parse_exclude_keywords(FITX_EXCLUDE_KEYWORDS)
+# Single alternation so each title is scanned once instead of once per keyword
+_EXCLUDE_RE = (
+    re.compile("|".join(re.escape(k) for k in EXCLUDE_KEYWORDS), re.IGNORECASE)
+    if EXCLUDE_KEYWORDS
+    else None
+)
 
 try:
     os.environ.setdefault("TZ", TZ)
@@ -57,16 +72,32 @@ except Exception:
 app = FastAPI()
 
 
+@dataclass(frozen=True)
+class _EncodedICS:
+    # UTF-8 ICS body plus pre-compressed variants, built once per refresh so
+    # /calendar.ics never re-encodes or compresses per request.
+    digest: str  # hex digest of the identity body
+    bodies: dict[str, bytes]  # content-coding -> body
+
+    def etag(self, encoding: str) -> str:
+        if encoding == "identity":
+            return f'"{self.digest}"'
+        return f'"{self.digest}-{encoding}"'
+
+
 # Shared state with concurrency protection
 cache_lock = asyncio.Lock()
-cache_ics: Optional[str] = None
+cache_ics: Optional[_EncodedICS] = None
 cache_events: Optional[List[CourseEvent]] = None
+# Digest of the events behind the ICS this process generated; unchanged events
+# skip regeneration and disk writes, keeping DTSTAMP and the ETag stable.
+_last_events_digest: Optional[bytes] = None
 client: Optional[httpx.AsyncClient] = None
 bg_task: Optional[asyncio.Task] = None
 
 
 async def _refresh_once() -> None:
-    global cache_ics, cache_events
+    global cache_events
     assert client is not None
     logger.info("Refreshing FitX schedule for branch_id=%s", FITX_COURSE_ID)
     try:
@@ -77,32 +108,34 @@ async def _refresh_once() -> None:
             weeks = max(1, FITX_WEEKS_AHEAD)
             for i in range(weeks):
                 date_from = monday + timedelta(days=i * 7)
-                data, content_type = await fetch_kursplan_html(
-                    client, FITX_COURSE_ID, date_from, FITX_COOKIE
-                )
+                data, content_type = await fetch_kursplan_html(client, FITX_COURSE_ID, date_from)
                 events.extend(parse_schedule(data, content_type))
         else:
-            data, content_type = await fetch_course_page(client, FITX_COURSE_ID, FITX_COOKIE)
+            data, content_type = await fetch_course_page(client, FITX_COURSE_ID)
             events = parse_schedule(data, content_type)
 
         # De-duplicate after multi-week fetch
-        uniq = {}
-        for e in events:
-            key = (e.id, int(e.start.timestamp()), int(e.end.timestamp()))
-            uniq[key] = e
-        events = sorted(uniq.values(), key=lambda e: (e.start, e.title))
+        events = dedupe_events(events)
 
         # Apply title-based filtering (case-insensitive substring match)
-        if EXCLUDE_KEYWORDS:
+        if _EXCLUDE_RE is not None:
             before = len(events)
-            lowered = [(e, e.title.lower()) for e in events]
-            events = [e for (e, t) in lowered if not any(k in t for k in EXCLUDE_KEYWORDS)]
+            search = _EXCLUDE_RE.search
+            events = [e for e in events if not search(e.title)]
             removed = before - len(events)
             if removed:
                 logger.info("Filtered %d events by keywords: %s", removed, ", ".join(EXCLUDE_KEYWORDS))
+        # Serialize once: the same bytes are hashed here and written to cache.json
+        events_json = encode_events(events)
+        digest = events_digest(events_json)
+        if digest == _last_events_digest:
+            async with cache_lock:
+                cache_events = events
+            logger.info("Refresh successful: %d events (unchanged)", len(events))
+            return
         ics_text = generate_ics(FITX_COURSE_ID, events)
         # Atomically persist and update in-memory
-        await _update_cache(events, ics_text)
+        await _update_cache(events, ics_text, events_json, digest)
         logger.info("Refresh successful: %d events", len(events))
     except Exception as e:
         logger.error("Refresh failed: %s", e)
@@ -117,14 +150,59 @@ def _tz_berlin():
         return None
 
 
-async def _update_cache(events: List[CourseEvent], ics_text: str) -> None:
-    global cache_ics, cache_events
+def _encode_ics(ics_text: str) -> _EncodedICS:
+    ics_bytes = ics_text.encode("utf-8")
+    bodies = {
+        "identity": ics_bytes,
+        "gzip": gzip.compress(ics_bytes, compresslevel=6, mtime=0),
+    }
+    if brotli is not None:
+        bodies["br"] = brotli.compress(ics_bytes, quality=5)
+    return _EncodedICS(hashlib.blake2b(ics_bytes, digest_size=16).hexdigest(), bodies)
+
+
+def _etag_matches(if_none_match: str, digest: str) -> bool:
+    # Any representation (identity/gzip/br) of the same body counts as a match
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/").strip('"').partition("-")[0] == digest:
+            return True
+    return False
+
+
+def _pick_encoding(accept_encoding: Optional[str], available: dict[str, bytes]) -> str:
+    if not accept_encoding:
+        return "identity"
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name.strip().lower()] = weight
+    default = weights.get("*", 0.0)
+    for enc in ("br", "gzip"):
+        if enc in available and weights.get(enc, default) > 0:
+            return enc
+    return "identity"
+
+
+async def _update_cache(
+    events: List[CourseEvent], ics_text: str, events_json: bytes, digest: bytes
+) -> None:
+    global cache_ics, cache_events, _last_events_digest
     # Save to disk first
-    save_cache(events, ics_text)
+    save_cache(events, ics_text, events_json)
+    encoded = _encode_ics(ics_text)
     # Update memory
     async with cache_lock:
         cache_events = events
-        cache_ics = ics_text
+        cache_ics = encoded
+        _last_events_digest = digest
 
 
 async def refresh_loop(stop_event: asyncio.Event) -> None:
@@ -143,16 +221,21 @@ async def refresh_loop(stop_event: asyncio.Event) -> None:
 async def on_startup() -> None:
     global client, bg_task, cache_ics, cache_events
     ensure_data_dir()
-    client = httpx.AsyncClient(http2=False, headers={})
-    # Try to load existing cache
+    client = build_client(FITX_COOKIE)
+    # Try to load existing cache. The events digest is deliberately not seeded
+    # from disk: cache.ics may come from an older generator (or be damaged), so
+    # the first refresh of each process always regenerates and rewrites it.
     ics_text, events = load_cache()
-    async with cache_lock:
-        cache_ics = ics_text
-        cache_events = events
     if ics_text:
         logger.info("Loaded cached ICS from disk")
     else:
         logger.info("No cached ICS found at startup")
+        # Serve an (empty) calendar until the first refresh so clients can subscribe
+        ics_text = generate_ics(FITX_COURSE_ID, events or [])
+    encoded = _encode_ics(ics_text)
+    async with cache_lock:
+        cache_ics = encoded
+        cache_events = events
     # Start background loop
     stop_event = asyncio.Event()
 
@@ -188,15 +271,30 @@ async def health() -> Response:
 
 
 @app.get("/calendar.ics")
-async def calendar() -> Response:
+async def calendar(
+    if_none_match: Optional[str] = Header(default=None, alias="If-None-Match"),
+    accept_encoding: Optional[str] = Header(default=None, alias="Accept-Encoding"),
+) -> Response:
     async with cache_lock:
-        current_ics = cache_ics
-        current_events = cache_events
-    if current_ics:
-        return Response(content=current_ics, media_type="text/calendar; charset=utf-8")
-    # if no cached ICS yet, serve an empty calendar so clients can subscribe
-    empty = generate_ics(FITX_COURSE_ID, current_events or [])
-    return Response(content=empty, media_type="text/calendar; charset=utf-8")
+        encoded = cache_ics
+    if encoded is None:
+        # Startup has not populated the cache yet
+        encoded = _encode_ics(generate_ics(FITX_COURSE_ID, []))
+    encoding = _pick_encoding(accept_encoding, encoded.bodies)
+    headers = {
+        "ETag": encoded.etag(encoding),
+        "Cache-Control": "public, max-age=300",
+        "Vary": "Accept-Encoding",
+    }
+    if if_none_match and _etag_matches(if_none_match, encoded.digest):
+        return Response(status_code=304, headers=headers)
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(
+        content=encoded.bodies[encoding],
+        media_type="text/calendar; charset=utf-8",
+        headers=headers,
+    )
 
 
 @app.post("/refresh")
@@ -5,11 +5,18 @@ import logging
 import re
 from dataclasses import asdict
 from datetime import datetime, timedelta, timezone
-from typing import Any, Iterable, List, Optional
+from typing import Any, Iterable, Iterator, List, Optional
 
-from bs4 import BeautifulSoup
+import orjson
 from zoneinfo import ZoneInfo
 
+try:
+    from selectolax.lexbor import LexborHTMLParser
+
+    HTMLParser: Any = LexborHTMLParser
+except ImportError:  # fall back to BeautifulSoup's pure-Python parser
+    HTMLParser = None
+
 from .models import CourseEvent
 
 
@@ -19,13 +26,22 @@ logger = logging.getLogger(__name__)
 BERLIN = ZoneInfo("Europe/Berlin")
 
 
+# strptime fallbacks for strings datetime.fromisoformat rejects
+_ISO_FMTS = (
+    "%Y-%m-%dT%H:%M:%S%z",
+    "%Y-%m-%d %H:%M:%S%z",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d",
+)
+
+
 def _parse_epoch(val: Any) -> Optional[datetime]:
     try:
         v = int(val)
         # Heuristic: ms vs s
-        if v > 1_000_000_000_000:
-            v = v / 1000.0
-        return datetime.fromtimestamp(v, tz=timezone.utc).astimezone(BERLIN)
+        ts = v / 1000.0 if v > 1_000_000_000_000 else v
+        return datetime.fromtimestamp(ts, tz=timezone.utc).astimezone(BERLIN)
     except Exception:
         return None
 
@@ -34,34 +50,45 @@ def _parse_iso(val: Any) -> Optional[datetime]:
     if not isinstance(val, str):
         return None
     s = val.strip()
+    if s.endswith("Z"):
+        s = s[:-1] + "+00:00"
     # Try straight ISO 8601
     try:
-        dt = datetime.fromisoformat(s.replace("Z", "+00:00"))
+        dt = datetime.fromisoformat(s)
         if dt.tzinfo is None:
             return dt.replace(tzinfo=BERLIN)
         return dt.astimezone(BERLIN)
-    except Exception:
+    except (ValueError, OverflowError):
         pass
+    # All fallback formats start with a year, so skip them for anything else
+    if not s[:1].isdigit():
+        return None
     # Try common formats
-    for fmt in (
-        "%Y-%m-%dT%H:%M:%S%z",
-        "%Y-%m-%d %H:%M:%S%z",
-        "%Y-%m-%dT%H:%M:%S",
-        "%Y-%m-%d %H:%M:%S",
-        "%Y-%m-%d",
-    ):
+    for fmt in _ISO_FMTS:
         try:
             dt = datetime.strptime(s, fmt)
             if fmt.endswith("%z"):
                 return dt.astimezone(BERLIN)
             return dt.replace(tzinfo=BERLIN)
-        except Exception:
+        except (ValueError, OverflowError):
             continue
     return None
 
 
 def parse_any_datetime(val: Any) -> Optional[datetime]:
-    return _parse_iso(val) or _parse_epoch(val)
+    if val is None:
+        return None
+    t = type(val)
+    if t is int or t is float:
+        return _parse_epoch(val)
+    if t is str:
+        dt = _parse_iso(val)
+        if dt is not None:
+            return dt
+        # Date-shaped strings ("YYYY-...") are never epoch numbers
+        if val[4:5] == "-":
+            return None
+    return _parse_epoch(val)
 
 
 EVENT_KEYS = [
@@ -77,65 +104,95 @@ EVENT_KEYS = [
 
 def extract_events_from_json(data: Any) -> list[dict[str, Any]]:
     found: list[dict[str, Any]] = []
-
-    def walk(obj: Any, path: str = "$") -> None:
-        if isinstance(obj, dict):
+    debug = logger.isEnabledFor(logging.DEBUG)
+
+    # Iterative pre-order walk (children pushed reversed to keep document order).
+    # JSON decoders only produce exact dict/list, so `type(...) is` is sufficient.
+    stack: list[Any] = [data]
+    pop = stack.pop
+    push = stack.extend
+    while stack:
+        obj = pop()
+        t = type(obj)
+        if t is dict:
             # Direct hits on common keys
             for k in EVENT_KEYS:
-                if k in obj and isinstance(obj[k], list):
-                    logger.debug("Found key '%s' at %s with %d items", k, path, len(obj[k]))
-                    for it in obj[k]:
-                        if isinstance(it, dict):
-                            found.append(it)
+                v = obj.get(k)
+                if type(v) is list:
+                    if debug:
+                        logger.debug("Found key '%s' with %d items", k, len(v))
+                    found.extend(it for it in v if type(it) is dict)
             # Continue walking
-            for k, v in obj.items():
-                walk(v, f"{path}.{k}")
-        elif isinstance(obj, list):
-            for i, v in enumerate(obj):
-                walk(v, f"{path}[{i}]")
+            push(reversed(obj.values()))
+        elif t is list:
+            push(reversed(obj))
 
-    walk(data)
     logger.debug("Total candidate events found: %d", len(found))
     return found
 
 
+# Candidate keys per field, in order of precedence
+_TITLE_KEYS = ("title", "name", "courseName", "course")
+_START_KEYS = (
+    "start",
+    "startTime",
+    "startDate",
+    "startDateTime",
+    "begin",
+    "from",
+    "date",
+    "dateStart",
+)
+_END_KEYS = ("end", "endTime", "endDate", "endDateTime", "to", "dateEnd")
+_DURATION_KEYS = ("durationMinutes", "duration", "length", "minutes")
+_ID_KEYS = ("id", "eventId", "uid")
+_LOCATION_KEYS = ("location", "place", "studio")
+_INSTRUCTOR_KEYS = ("instructor", "trainer", "coach")
+_ROOM_KEYS = ("room", "hall")
+_DESCRIPTION_KEYS = ("description", "details")
+
+
+def _pick(it: dict[str, Any], keys: tuple[str, ...]) -> Any:
+    for k in keys:
+        v = it.get(k)
+        if v:
+            return v
+    return None
+
+
+def _pick_dt(it: dict[str, Any], keys: tuple[str, ...]) -> Optional[datetime]:
+    for k in keys:
+        v = it.get(k)
+        if v is not None:
+            dt = parse_any_datetime(v)
+            if dt:
+                return dt
+    return None
+
+
+def _pick_str(it: dict[str, Any], keys: tuple[str, ...]) -> Optional[str]:
+    for k in keys:
+        v = _coerce_str(it.get(k))
+        if v:
+            return v
+    return None
+
+
 def coerce_event(it: dict[str, Any]) -> Optional[CourseEvent]:
     # Title
-    title = (
-        it.get("title")
-        or it.get("name")
-        or it.get("courseName")
-        or it.get("course")
-        or "FitX Course"
-    )
+    title = _pick(it, _TITLE_KEYS) or "FitX Course"
 
     # Start
-    start = (
-        parse_any_datetime(it.get("start"))
-        or parse_any_datetime(it.get("startTime"))
-        or parse_any_datetime(it.get("startDate"))
-        or parse_any_datetime(it.get("startDateTime"))
-        or parse_any_datetime(it.get("begin"))
-        or parse_any_datetime(it.get("from"))
-        or parse_any_datetime(it.get("date"))
-        or parse_any_datetime(it.get("dateStart"))
-    )
+    start = _pick_dt(it, _START_KEYS)
     if not start:
         return None
 
     # End
-    end = (
-        parse_any_datetime(it.get("end"))
-        or parse_any_datetime(it.get("endTime"))
-        or parse_any_datetime(it.get("endDate"))
-        or parse_any_datetime(it.get("endDateTime"))
-        or parse_any_datetime(it.get("to"))
-        or parse_any_datetime(it.get("dateEnd"))
-    )
+    end = _pick_dt(it, _END_KEYS)
     if not end:
         # try to build from duration
         dur_min = None
-        for dk in ("durationMinutes", "duration", "length", "minutes"):
+        for dk in _DURATION_KEYS:
             v = it.get(dk)
             if v is not None:
                 try:
@@ -150,43 +207,18 @@ def coerce_event(it: dict[str, Any]) -> Optional[CourseEvent]:
             end = start + timedelta(minutes=60)
 
     # Id
-    cid = (
-        it.get("id")
-        or it.get("eventId")
-        or it.get("uid")
-        or f"{title}-{int(start.timestamp())}"
-    )
+    cid = _pick(it, _ID_KEYS) or f"{title}-{int(start.timestamp())}"
     cid = str(cid)
 
-    # Optional fields
-    location = (
-        _coerce_str(it.get("location"))
-        or _coerce_str(it.get("place"))
-        or _coerce_str(it.get("studio"))
-        or None
-    )
-    instructor = (
-        _coerce_str(it.get("instructor"))
-        or _coerce_str(it.get("trainer"))
-        or _coerce_str(it.get("coach"))
-        or None
-    )
-    room = _coerce_str(it.get("room")) or _coerce_str(it.get("hall")) or None
-    description = (
-        _coerce_str(it.get("description"))
-        or _coerce_str(it.get("details"))
-        or None
-    )
-
     return CourseEvent(
         id=cid,
         title=str(title),
         start=start,
         end=end,
-        location=location,
-        instructor=instructor,
-        room=room,
-        description=description,
+        location=_pick_str(it, _LOCATION_KEYS),
+        instructor=_pick_str(it, _INSTRUCTOR_KEYS),
+        room=_pick_str(it, _ROOM_KEYS),
+        description=_pick_str(it, _DESCRIPTION_KEYS),
     )
 
 
@@ -201,106 +233,199 @@ def _coerce_str(v: Any) -> Optional[str]:
         return None
 
 
+# Literals orjson rejects but the stdlib accepts (NaN/Infinity, integers
+# beyond 64 bits); only str input containing one is worth a second parse.
+_STDLIB_ONLY_RE = re.compile(r"NaN|Infinity|\d{20}")
+
+
+def _loads(data: bytes | str) -> Any:
+    # orjson decodes straight from bytes with no intermediate str
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        if isinstance(data, bytes):
+            # Invalid UTF-8: replace like the stdlib decode path would
+            return json.loads(data.decode("utf-8", errors="replace"))
+        if _STDLIB_ONLY_RE.search(data):
+            return json.loads(data)
+        raise
+
+
 def parse_schedule(data: bytes, content_type: Optional[str]) -> List[CourseEvent]:
     # 1) If content-type is JSON or data looks like JSON, parse directly
     ct = (content_type or "").lower()
-    text = None
     if "application/json" in ct or (data[:1] in (b"{", b"[")):
         try:
-            obj = json.loads(data.decode("utf-8", errors="replace"))
+            obj = _loads(data)
             return _build_events_from_obj(obj)
         except Exception as e:
             logger.debug("Direct JSON parse failed: %s", e)
 
-    # 2) Otherwise, treat as HTML with embedded JSON
-    try:
-        text = data.decode("utf-8", errors="replace")
-    except Exception:
-        text = None
+    # 2) Otherwise, treat as HTML with embedded JSON. Decode once, replacing
+    # invalid UTF-8, so a stray byte cannot break the tree walk below.
+    text = data.decode("utf-8", errors="replace")
     if not text:
         raise ValueError("Response is not decodable as UTF-8 text")
 
-    soup = BeautifulSoup(text, "html.parser")
+    tree = _parse_html(text)
 
     # 2a) Try kursplan HTML (week grid)
-    kursplan_events = _parse_kursplan_html(soup)
+    kursplan_events = _parse_kursplan_html(tree)
     if kursplan_events:
         return kursplan_events
 
-    # Try <script type="application/ld+json"> first
-    for sc in soup.find_all("script"):
-        t = (sc.get("type") or "").lower()
+    # Single pass over <script> tags: try JSON-typed ones (e.g. ld+json) right
+    # away and keep every body for the embedded-JSON fallback below.
+    bodies: list[str] = []
+    for sc in _select(tree, "script"):
+        content = _script_text(sc).strip()
+        if not content:
+            continue
+        bodies.append(content)
+        t = (_attr(sc, "type") or "").lower()
         if "json" in t:
-            content = sc.string or sc.text or ""
-            content = content.strip()
-            if not content:
-                continue
             try:
-                obj = json.loads(content)
+                obj = _loads(content)
                 events = _build_events_from_obj(obj)
                 if events:
                     return events
             except Exception:
                 continue
 
-    # Fallback: scan all script tags for JSON-like blocks
-    scripts = [sc.string or sc.text or "" for sc in soup.find_all("script")]
-    candidates: list[str] = []
-    for s in scripts:
-        s = s.strip()
-        if not s:
-            continue
-        # Heuristic: extract big JSON arrays/objects
-        for m in re.finditer(r"(\{.*?\}|\[.*?\])", s, re.DOTALL):
-            chunk = m.group(1)
+    # Fallback: scan all script bodies for balanced top-level JSON-like blocks
+    for s in bodies:
+        for chunk in _iter_json_blobs(s):
             # Filter too small
             if len(chunk) < 10:
                 continue
-            candidates.append(chunk)
-
-    # Try larger candidates first
-    candidates.sort(key=len, reverse=True)
-    for c in candidates[:50]:
-        try:
-            obj = json.loads(c)
-            events = _build_events_from_obj(obj)
-            if events:
-                return events
-        except Exception:
-            continue
+            try:
+                obj = _loads(chunk)
+                events = _build_events_from_obj(obj)
+                if events:
+                    return events
+            except Exception:
+                continue
 
     raise ValueError("Unable to parse schedule from response (no events found)")
 
 
+# Tokens that matter for brace matching; an escape consumes the following char.
+_JSON_TOKEN_RE = re.compile(r'\\.|["{}\[\]]', re.DOTALL)
+
+
+def _iter_json_blobs(s: str) -> Iterator[str]:
+    # Linear pass yielding balanced top-level {...} / [...] spans. String state
+    # is tracked at every depth so braces inside top-level string literals do
+    # not open a blob. If the input ends while a blob is still open, that
+    # opener was not real JSON: rescan from just after it.
+    pos = 0
+    while True:
+        depth = 0
+        start = 0
+        in_string = False
+        for m in _JSON_TOKEN_RE.finditer(s, pos):
+            tok = m.group()
+            if in_string:
+                if tok == '"':
+                    in_string = False
+            elif tok == '"':
+                in_string = True
+            elif tok == "{" or tok == "[":
+                if depth == 0:
+                    start = m.start()
+                depth += 1
+            elif (tok == "}" or tok == "]") and depth:
+                depth -= 1
+                if depth == 0:
+                    yield s[start : m.end()]
+        if depth == 0:
+            return
+        pos = start + 1
+
+
+def _event_sort_key(e: CourseEvent) -> tuple[datetime, str]:
+    return (e.start, e.title)
+
+
+def _dedupe_key(e: CourseEvent) -> tuple[str, datetime, datetime]:
+    # Datetimes sharing a tzinfo compare/hash by wall time and ignore `fold`,
+    # so the two 02:30 on the DST fall-back night would collide; normalize to UTC.
+    return (e.id, e.start.astimezone(timezone.utc), e.end.astimezone(timezone.utc))
+
+
+def dedupe_events(events: Iterable[CourseEvent]) -> List[CourseEvent]:
+    # Deduplicate by (id,start,end); last occurrence wins
+    uniq = {_dedupe_key(e): e for e in events}
+    return sorted(uniq.values(), key=_event_sort_key)
+
+
 def _build_events_from_obj(obj: Any) -> List[CourseEvent]:
     candidates = extract_events_from_json(obj)
-    events: list[CourseEvent] = []
+    # Deduplicate by (id,start,end) while coercing
+    uniq: dict[tuple[str, datetime, datetime], CourseEvent] = {}
     for it in candidates:
         ev = coerce_event(it)
         if ev:
-            events.append(ev)
-    # Deduplicate by (id,start,end)
-    uniq = {}
-    for e in events:
-        key = (e.id, int(e.start.timestamp()), int(e.end.timestamp()))
-        uniq[key] = e
-    events = sorted(uniq.values(), key=lambda e: (e.start, e.title))
+            uniq[_dedupe_key(ev)] = ev
+    events = sorted(uniq.values(), key=_event_sort_key)
     logger.debug("Parsed %d events after normalization", len(events))
     return events
 
 
-def _parse_kursplan_html(soup: BeautifulSoup) -> List[CourseEvent]:
+# Thin accessors so the HTML branch works on either a selectolax tree (C
+# parser, preferred) or a BeautifulSoup tree when selectolax is unavailable.
+def _parse_html(text: str) -> Any:
+    if HTMLParser is not None:
+        return HTMLParser(text)
+    from bs4 import BeautifulSoup  # type: ignore[import-untyped]
+
+    return BeautifulSoup(text, "html.parser")
+
+
+def _select(node: Any, css: str) -> list[Any]:
+    if HTMLParser is not None:
+        return node.css(css)
+    return node.select(css)
+
+
+def _select_one(node: Any, css: str) -> Any:
+    if HTMLParser is not None:
+        return node.css_first(css)
+    return node.select_one(css)
+
+
+def _attr(node: Any, name: str) -> Optional[str]:
+    v = node.attributes.get(name) if HTMLParser is not None else node.get(name)
+    if isinstance(v, list):
+        # BeautifulSoup returns multi-valued attributes (class) as lists
+        v = " ".join(v)
+    return v
+
+
+def _text(node: Any) -> str:
+    if HTMLParser is not None:
+        return node.text(separator=" ", strip=True)
+    return node.get_text(" ", strip=True)
+
+
+def _script_text(node: Any) -> str:
+    if HTMLParser is not None:
+        return node.text() or ""
+    return node.string or node.text or ""
+
+
+def _parse_kursplan_html(tree: Any) -> List[CourseEvent]:
     # Detect kursplan markup
-    if not soup.select_one(".courses_plan__day"):
+    day_nodes = _select(tree, ".courses_plan__day")
+    if not day_nodes:
         return []
 
     events: list[CourseEvent] = []
-    day_nodes = soup.select(".courses_plan__day")
     for day in day_nodes:
-        day_header = day.select_one(".courses_plan__day__date")
+        day_header = _select_one(day, ".courses_plan__day__date")
         if not day_header:
             continue
-        header_text = " ".join(day_header.get_text(" ", strip=True).split())
+        header_text = " ".join(_text(day_header).split())
         # Expect a date like "09.02.2026"
         m = re.search(r"(\d{2}\.\d{2}\.\d{4})", header_text)
         if not m:
@@ -311,19 +436,18 @@ def _parse_kursplan_html(soup: BeautifulSoup) -> List[CourseEvent]:
         except Exception:
             continue
 
-        for entry in day.select(".courses_plan__entry"):
+        for entry in _select(day, ".courses_plan__entry"):
             # Skip empty/filler blocks
-            cls = entry.get("class") or []
-            if any("empty" in c for c in cls):
+            if "empty" in (_attr(entry, "class") or ""):
                 continue
 
-            title = entry.get("data-title") or "FitX Course"
-            regular_id = entry.get("data-regular-course-id")
+            title = _attr(entry, "data-title") or "FitX Course"
+            regular_id = _attr(entry, "data-regular-course-id")
 
-            times = entry.select_one(".courses_plan__times")
+            times = _select_one(entry, ".courses_plan__times")
             if not times:
                 continue
-            times_text = " ".join(times.get_text(" ", strip=True).split())
+            times_text = " ".join(_text(times).split())
             tm = re.search(r"(\d{1,2}:\d{2})\s*-\s*(\d{1,2}:\d{2})", times_text)
             if not tm:
                 continue
@@ -352,9 +476,4 @@ def _parse_kursplan_html(soup: BeautifulSoup) -> List[CourseEvent]:
                 )
             )
 
-    # Deduplicate by (id,start,end)
-    uniq = {}
-    for e in events:
-        key = (e.id, int(e.start.timestamp()), int(e.end.timestamp()))
-        uniq[key] = e
-    return sorted(uniq.values(), key=lambda e: (e.start, e.title))
+    return dedupe_events(events)
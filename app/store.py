@@ -1,9 +1,12 @@
 from __future__ import annotations
 
-import json
+import hashlib
 import os
+import pickle
 from pathlib import Path
-from typing import Any, List
+from typing import List, Optional
+
+import orjson
 
 from .models import CourseEvent
 
@@ -11,41 +14,82 @@ from .models import CourseEvent
 DATA_DIR = Path(os.environ.get("DATA_DIR", "/data")).resolve()
 CACHE_ICS = DATA_DIR / "cache.ics"
 CACHE_JSON = DATA_DIR / "cache.json"
+CACHE_PICKLE = DATA_DIR / "cache.pkl"
+# fsync cache files (and the data dir) on write; can be disabled on ephemeral volumes
+DURABLE_CACHE = os.environ.get("DURABLE_CACHE", "true").lower() in ("1", "true", "yes")
+
+# Prefix for cache.pkl; bump the version whenever CourseEvent changes shape so
+# stale pickles are ignored (and cache.json is used) instead of mis-loaded.
+_PICKLE_MAGIC = b"FITXEVENTS2\n"
 
 
 def ensure_data_dir() -> None:
     DATA_DIR.mkdir(parents=True, exist_ok=True)
 
 
-def atomic_write(path: Path, data: bytes) -> None:
+def _write_tmp(path: Path, data: bytes) -> Path:
     tmp = path.with_suffix(path.suffix + ".tmp")
     with open(tmp, "wb") as f:
         f.write(data)
-        f.flush()
-        os.fsync(f.fileno())
-    os.replace(tmp, path)
+        if DURABLE_CACHE:
+            f.flush()
+            os.fsync(f.fileno())
+    return tmp
+
+
+def _fsync_dir(path: Path) -> None:
+    # Persist the renames themselves; not supported everywhere (e.g. Windows)
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write_all(files: list[tuple[Path, bytes]]) -> None:
+    # Write every temp file first, then swap them all in, then sync the
+    # directory once rather than once per file.
+    tmps = [(_write_tmp(path, data), path) for path, data in files]
+    for tmp, path in tmps:
+        os.replace(tmp, path)
+    if DURABLE_CACHE:
+        _fsync_dir(DATA_DIR)
+
 
+def encode_events(events: List[CourseEvent]) -> bytes:
+    # JSON (normalized parsed events), as stored in cache.json. orjson
+    # serializes the dataclasses and aware datetimes natively (ISO 8601, same
+    # as isoformat()), so no intermediate per-event dicts are built.
+    return orjson.dumps(list(events), option=orjson.OPT_INDENT_2)
 
-def save_cache(events: List[CourseEvent], ics_text: str) -> None:
+
+def events_digest(events_json: bytes) -> bytes:
+    # Digest of an encode_events() payload
+    return hashlib.blake2b(events_json, digest_size=16).digest()
+
+
+def save_cache(
+    events: List[CourseEvent], ics_text: str, events_json: Optional[bytes] = None
+) -> None:
+    # events_json: encode_events(events) if the caller already has it
     ensure_data_dir()
-    # Save JSON (normalized parsed events)
-    json_payload: list[dict[str, Any]] = []
-    for e in events:
-        json_payload.append(
-            {
-                "id": e.id,
-                "title": e.title,
-                "start": e.start.isoformat(),
-                "end": e.end.isoformat(),
-                "location": e.location,
-                "instructor": e.instructor,
-                "room": e.room,
-                "description": e.description,
-            }
-        )
-    atomic_write(CACHE_JSON, json.dumps(json_payload, ensure_ascii=False, indent=2).encode("utf-8"))
-    # Save ICS
-    atomic_write(CACHE_ICS, ics_text.encode("utf-8"))
+    if events_json is None:
+        events_json = encode_events(events)
+    atomic_write_all(
+        [
+            # JSON (normalized parsed events)
+            (CACHE_JSON, events_json),
+            # Pickle (fast startup load; datetimes restored without re-parsing)
+            (CACHE_PICKLE, _PICKLE_MAGIC + pickle.dumps(list(events), protocol=5)),
+            # ICS
+            (CACHE_ICS, ics_text.encode("utf-8")),
+        ]
+    )
 
 
 def load_cache() -> tuple[str | None, list[CourseEvent] | None]:
@@ -53,12 +97,20 @@ def load_cache() -> tuple[str | None, list[CourseEvent] | None]:
     events: list[CourseEvent] | None = None
     if CACHE_ICS.exists():
         try:
-            ics_text = CACHE_ICS.read_text(encoding="utf-8")
+            # Decode bytes directly; read_text() would turn the CRLFs into LFs
+            ics_text = CACHE_ICS.read_bytes().decode("utf-8")
         except Exception:
             ics_text = None
-    if CACHE_JSON.exists():
+    if CACHE_PICKLE.exists():
+        try:
+            raw_pkl = CACHE_PICKLE.read_bytes()
+            if raw_pkl.startswith(_PICKLE_MAGIC):
+                events = pickle.loads(raw_pkl[len(_PICKLE_MAGIC) :])
+        except Exception:
+            events = None
+    if events is None and CACHE_JSON.exists():
         try:
-            raw = json.loads(CACHE_JSON.read_text(encoding="utf-8"))
+            raw = orjson.loads(CACHE_JSON.read_bytes())
             from datetime import datetime
             from zoneinfo import ZoneInfo
 